@@ -1,4 +1,4 @@
-from minimax import MinimaxAI
+from minimax import MinimaxAI, load_weights, weights_fingerprint
 import random, time, os
 
 class Game(object):
@@ -386,12 +386,28 @@ class AIPlayer(Player):
     the best move based on the current state of the game.
     """
 
-    def __init__(self, name, color, difficulty=5):
+    def __init__(self, name, color, difficulty=5, weights="auto", cache=None):
         super().__init__(name, color)  # Initialize base class attributes
         self.type = "AI"  # Designates the type of player as AI
         self.difficulty = (
             difficulty  # Difficulty level for the AI's decision-making process
         )
+        # Tuned evaluation weights; "auto" uses the cache's weights, or weights.json when
+        # present, and None the streak heuristic
+        auto = isinstance(weights, str) and weights == "auto"
+        if auto and cache is not None:
+            weights = cache.weights
+        elif auto:
+            try:
+                weights = load_weights()
+            except ValueError as error:
+                print(f"Ignoring tuned weights: {error}")
+                weights = None
+        self.weights = None if weights is None else list(map(float, weights))
+        # Position cache shared with other AI players and worker processes, if any
+        if cache is not None and cache.fingerprint != weights_fingerprint(self.weights):
+            raise ValueError("Position cache holds scores from different evaluation weights")
+        self.cache = cache
 
     def move(self, state):
         """
@@ -403,7 +419,10 @@ class AIPlayer(Player):
         # Delay to simulate thinking 
         # time.sleep(random.uniform(0.8, 1.6))
 
+        # MinimaxAI expects the top row first, while the game board starts at the bottom
+        state = state[::-1]
+
         # Instantiate minimax and get the best move
-        minimax = MinimaxAI(state)
+        minimax = MinimaxAI(state, self.weights, self.cache)
         best_move, _ = minimax.optimal_move(self.difficulty, state, self.color)
         return best_move
@@ -1,11 +1,88 @@
+import hashlib
+import json
+import math
+import os
 import random
+import struct
+
+# MinimaxAI boards are stored top row first: pieces drop towards row 5. Game keeps
+# its board bottom row first, so AIPlayer flips it before searching.
+BOTTOM_ROW = 5
+
+# Evaluation features, in the order used by weight vectors and parameter files.
+# Each feature is measured as (player's count - opponent's count).
+FEATURES = (
+    "window_1",           # windows holding 1 own piece and 3 empty cells
+    "window_2",           # windows holding 2 own pieces and 2 empty cells
+    "window_3",           # windows holding 3 own pieces and 1 empty cell
+    "window_3_playable",  # window_3 whose empty cell can be filled right now
+    "blocked_3",          # windows holding 3 own pieces capped by an opponent piece
+    "center",             # own pieces in the center column
+    "center_adjacent",    # own pieces in the two columns beside the center
+)
+
+# Every four-cell window on the 6x7 board as a tuple of (row, col) cells.
+WINDOWS = [
+    tuple((row + i * dx, col + i * dy) for i in range(4))
+    for row in range(6) for col in range(7)
+    for dx, dy in [(-1, 1), (0, 1), (1, 1), (1, 0)]
+    if 0 <= row + 3 * dx < 6 and 0 <= col + 3 * dy < 7
+]
+
+DEFAULT_WEIGHTS_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "weights.json")
+
+
+def load_weights(path=DEFAULT_WEIGHTS_PATH):
+    """Load tuned evaluation weights from a parameter file, or None if it doesn't exist."""
+    if not os.path.exists(path):
+        return None
+    with open(path) as f:
+        params = json.load(f)
+    weights = params.get("weights") if isinstance(params, dict) else None
+    if not isinstance(weights, dict):
+        raise ValueError(f"Parameter file {path} has no weights")
+    missing = [name for name in FEATURES if name not in weights]
+    if missing:
+        raise ValueError(f"Parameter file {path} is missing weights for: {', '.join(missing)}")
+    values = []
+    for name in FEATURES:
+        try:
+            value = float(weights[name])
+        except (TypeError, ValueError):
+            raise ValueError(f"Parameter file {path} has a non-numeric weight for {name}") from None
+        if not math.isfinite(value):
+            raise ValueError(f"Parameter file {path} has a non-finite weight for {name}")
+        values.append(value)
+    return values
+
+
+def save_weights(weights, path=DEFAULT_WEIGHTS_PATH, **metadata):
+    """Write evaluation weights to a parameter file that load_weights can read back."""
+    params = dict(metadata, weights=dict(zip(FEATURES, (float(w) for w in weights))))
+    with open(path, "w") as f:
+        json.dump(params, f, indent=2)
+
+
+def weights_fingerprint(weights):
+    """Returns a 64-bit fingerprint of evaluation weights, 0 for the streak heuristic."""
+    if weights is None:
+        return 0
+    packed = struct.pack(f"<{len(weights)}d", *weights)
+    return int.from_bytes(hashlib.blake2b(packed, digest_size=8).digest(), "little") or 1
+
 
 class MinimaxAI:
     """Minimax AI for Connect Four with enhanced readability and adjusted structure."""
 
-    def __init__(self, board):
+    def __init__(self, board, weights=None, cache=None):
         self.board = [row.copy() for row in board]
         self.players = ['x', 'o']
+        # Tuned feature weights (see FEATURES); None keeps the streak heuristic
+        self.weights = weights
+        # Optional position cache (see position_cache.SharedPositionCache)
+        if cache is not None and cache.fingerprint != weights_fingerprint(weights):
+            raise ValueError("Position cache holds scores from different evaluation weights")
+        self.cache = cache
 
     def optimal_move(self, depth, state, player):
         """Determines the optimal move using Minimax algorithm."""
@@ -26,14 +103,24 @@ class MinimaxAI:
 
     def minimax(self, depth, state, player):
         """Recursive search to explore all possible moves up to a given depth."""
+        if self.cache is not None:
+            key = self.cache.position_key(state, player)
+            entry = self.cache.probe(key, depth)
+            if entry is not None:
+                return entry.score
+
         if depth == 0 or self.is_terminal(state):
-            return self.evaluate(state, player)
-        
-        opponent = self.players[1] if player == self.players[0] else self.players[0]
-        values = [-self.minimax(depth - 1, self.simulate_move(state, col, player), opponent)
-                  for col in range(7) if self.valid_move(col, state)]
+            value, best_move = self.evaluate(state, player), -1
+        else:
+            opponent = self.players[1] if player == self.players[0] else self.players[0]
+            values = {col: -self.minimax(depth - 1, self.simulate_move(state, col, player), opponent)
+                      for col in range(7) if self.valid_move(col, state)}
+            best_move = max(values, key=values.get) if values else -1
+            value = values[best_move] if values else 0
 
-        return max(values) if values else 0
+        if self.cache is not None:
+            self.cache.store(key, depth, value, move=best_move)
+        return value
 
     def valid_move(self, col, state):
         """Check if dropping a piece in the column is a valid move."""
@@ -46,19 +133,25 @@ class MinimaxAI:
     def simulate_move(self, state, col, player):
         """Returns a new state after making a move in the specified column."""
         temp_state = [row.copy() for row in state]
-        for row in reversed(range(6)):
+        for row in range(BOTTOM_ROW, -1, -1):
             if temp_state[row][col] == " ":
                 temp_state[row][col] = player
                 break
         return temp_state
 
     def evaluate(self, state, player):
-        """Evaluates the board using a simple heuristic based on streak counts."""
+        """Evaluates the board using tuned feature weights, or the streak heuristic without them."""
         if player == self.players[0]:
             opponent = self.players[1]
         else:
             opponent = self.players[0]
 
+        if self.weights is not None:
+            if self.count_streak(state, opponent, 4):
+                return -float('inf')
+            features = self.extract_features(state, player)
+            return sum(w * f for w, f in zip(self.weights, features))
+
         player_score = sum(self.count_streak(state, player, k) * (10**k) for k in range(2, 5))
         opponent_score = sum(self.count_streak(state, opponent, k) * (10**k) for k in range(2, 5))
 
@@ -83,3 +176,31 @@ class MinimaxAI:
             if all(state[row + i * dx][col + i * dy] == player for i in range(streak)):
                 return 1
         return 0
+
+    def extract_features(self, state, player):
+        """Returns the FEATURES vector for the board from the given player's perspective."""
+        opponent = self.players[1] if player == self.players[0] else self.players[0]
+        counts = {player: [0] * len(FEATURES), opponent: [0] * len(FEATURES)}
+
+        for window in WINDOWS:
+            cells = [state[row][col] for row, col in window]
+            for own, other in [(player, opponent), (opponent, player)]:
+                mine, theirs = cells.count(own), cells.count(other)
+                if theirs == 0 and 1 <= mine <= 3:
+                    counts[own][mine - 1] += 1
+                    if mine == 3 and any(self.is_playable(state, row, col)
+                                         for row, col in window if state[row][col] == " "):
+                        counts[own][3] += 1
+                elif mine == 3 and theirs == 1:
+                    counts[own][4] += 1
+
+        for row in range(6):
+            for col, feature in [(3, 5), (2, 6), (4, 6)]:
+                if state[row][col] in counts:
+                    counts[state[row][col]][feature] += 1
+
+        return [mine - theirs for mine, theirs in zip(counts[player], counts[opponent])]
+
+    def is_playable(self, state, row, col):
+        """Checks whether the empty cell would be filled by the next piece dropped in its column."""
+        return state[row][col] == " " and (row == BOTTOM_ROW or state[row + 1][col] != " ")
@@ -0,0 +1,272 @@
+"""Position cache shared by MinimaxAI searches across worker processes.
+
+The cache is a fixed-size table of 24-byte records in multiprocessing.shared_memory.
+Each record holds a check word, a data word packing the search depth, score bound
+and best move, and the score as a float64. The check word is the position key XOR
+the other two words. Readers accept a record only when the XOR gives back their key,
+so a record torn by a concurrent write reads as a miss and no locking is needed.
+The header records a fingerprint of the evaluation weights the scores came from.
+
+    python3 position_cache.py --workers 4 --depth 3
+"""
+import argparse
+import os
+import random
+import struct
+import sys
+import time
+from collections import namedtuple
+from multiprocessing import Pool, resource_tracker, shared_memory, util
+
+from minimax import MinimaxAI, load_weights, weights_fingerprint
+
+# Score bounds; MinimaxAI searches without pruning, so it only stores EXACT scores
+EXACT, LOWER, UPPER = 0, 1, 2
+
+HEADER = struct.Struct("<4sIQQ")    # magic, version, number of entries, weights fingerprint
+RECORD = struct.Struct("<QQQ")      # check word (key ^ data ^ score), data word, score bits
+DATA = struct.Struct("<BBbBxxxx")   # depth, bound, best move, flags
+SCORE = struct.Struct("<d")
+MAGIC, VERSION = b"C4PC", 2
+VALID, INT_SCORE = 1, 2             # flags
+
+# Zobrist keys for each (row, col, color) and for the player to move
+_rng = random.Random(0xC4)
+ZOBRIST = {(row, col, color): _rng.getrandbits(64)
+           for row in range(6) for col in range(7) for color in ["x", "o"]}
+TO_MOVE = {"x": _rng.getrandbits(64), "o": _rng.getrandbits(64)}
+
+CacheEntry = namedtuple("CacheEntry", ["depth", "score", "bound", "move"])
+
+
+def position_key(state, player):
+    """Returns the 64-bit Zobrist key of the board with the given player to move."""
+    key = TO_MOVE[player]
+    for row in range(6):
+        for col in range(7):
+            if state[row][col] != " ":
+                key ^= ZOBRIST[row, col, state[row][col].lower()]
+    return key
+
+
+class SharedPositionCache:
+    """
+    Fixed-size position cache in shared memory. Create it once in the parent process;
+    worker processes get attached copies when it is pickled (e.g. passed to a Pool).
+    The cache is bound to the evaluation weights its scores come from (None for the
+    streak heuristic); MinimaxAI refuses to use it with any other weights.
+    """
+
+    def __init__(self, entries=1 << 20, name=None, path=None, weights=None):
+        self.entries = entries
+        self.owner = name is None
+        self.weights = weights
+        self.fingerprint = weights_fingerprint(weights)
+        self.hits = self.misses = self.stores = 0
+
+        if self.owner:
+            self.shm = shared_memory.SharedMemory(create=True, size=HEADER.size + entries * RECORD.size)
+            HEADER.pack_into(self.shm.buf, 0, MAGIC, VERSION, entries, self.fingerprint)
+            if path is not None and os.path.exists(path):
+                self.load(path)
+        else:
+            self.shm = self._attach(name)
+            magic, version, self.entries, fingerprint = HEADER.unpack_from(self.shm.buf, 0)
+            if (magic, version) != (MAGIC, VERSION):
+                self.shm.close()
+                raise ValueError(f"Shared memory block {name} is not a position cache")
+            if fingerprint != self.fingerprint:
+                self.shm.close()
+                raise ValueError(f"Position cache {name} holds scores from different evaluation weights")
+
+    @staticmethod
+    def _attach(name):
+        """Attach to an existing block without letting this process's exit unlink it."""
+        if sys.version_info >= (3, 13):
+            return shared_memory.SharedMemory(name=name, track=False)
+        shm = shared_memory.SharedMemory(name=name)
+        # Only POSIX uses the resource tracker; Windows frees the block with its last handle
+        if os.name == "posix":
+            resource_tracker.unregister(shm._name, "shared_memory")
+        return shm
+
+    position_key = staticmethod(position_key)
+
+    @property
+    def name(self):
+        return self.shm.name
+
+    @property
+    def hit_rate(self):
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def __getstate__(self):
+        return {"entries": self.entries, "name": self.name, "weights": self.weights}
+
+    def __setstate__(self, state):
+        self.__init__(state["entries"], name=state["name"], weights=state["weights"])
+
+    def _read(self, key):
+        """Returns the offset of the key's slot and its CacheEntry, or None for another position."""
+        offset = HEADER.size + (key % self.entries) * RECORD.size
+        check, data, score_bits = RECORD.unpack_from(self.shm.buf, offset)
+        if not data or check ^ data ^ score_bits != key:
+            return offset, None
+        depth, bound, move, flags = DATA.unpack(data.to_bytes(8, "little"))
+        score = SCORE.unpack(score_bits.to_bytes(8, "little"))[0]
+        return offset, CacheEntry(depth, int(score) if flags & INT_SCORE else score, bound, move)
+
+    def probe(self, key, depth=0):
+        """Returns the CacheEntry for the key if it was searched at least `depth` deep, or None on a miss."""
+        _, entry = self._read(key)
+        if entry is not None and entry.depth >= depth:
+            self.hits += 1
+            return entry
+        self.misses += 1
+        return None
+
+    def store(self, key, depth, score, bound=EXACT, move=-1):
+        """
+        Store a search result for the key. An existing result for the same position
+        is only replaced by one searched at least as deep; other positions are overwritten.
+        """
+        offset, entry = self._read(key)
+        if entry is not None and entry.depth > depth:
+            return
+        flags = VALID | (INT_SCORE if isinstance(score, int) else 0)
+        data = int.from_bytes(DATA.pack(depth, bound, move, flags), "little")
+        score_bits = int.from_bytes(SCORE.pack(score), "little")
+        RECORD.pack_into(self.shm.buf, offset, key ^ data ^ score_bits, data, score_bits)
+        self.stores += 1
+
+    def lookup(self, state, player, depth=0):
+        """Returns the CacheEntry for the board with the given player to move, or None."""
+        return self.probe(position_key(state, player), depth)
+
+    def save(self, path):
+        """Write the cache contents to a file so later runs can start warm."""
+        with open(path, "wb") as f:
+            f.write(self.shm.buf)
+
+    def load(self, path):
+        """
+        Fill the cache from a file written by save(). Files of another size or
+        saved with other evaluation weights are ignored.
+        """
+        with open(path, "rb") as f:
+            contents = f.read()
+        expected = (MAGIC, VERSION, self.entries, self.fingerprint)
+        if len(contents) != self.shm.size or HEADER.unpack_from(contents, 0) != expected:
+            return False
+        self.shm.buf[:] = contents
+        return True
+
+    def close(self):
+        """Detach from the shared memory; the creating process also frees it."""
+        self.shm.close()
+        if self.owner:
+            # An attached copy may have unregistered the block from our resource tracker
+            if os.name == "posix":
+                resource_tracker.register(self.shm._name, "shared_memory")
+            self.shm.unlink()
+
+
+_worker_cache = None
+
+
+def _init_worker(cache):
+    global _worker_cache
+    _worker_cache = cache
+
+
+def _init_private_worker(entries, weights):
+    global _worker_cache
+    _worker_cache = SharedPositionCache(entries, weights=weights)
+    util.Finalize(_worker_cache, _worker_cache.close, exitpriority=10)
+
+
+def _search(task):
+    """Search a position in a worker and return the (hits, misses) it caused."""
+    state, player, depth, weights = task
+    hits, misses = (_worker_cache.hits, _worker_cache.misses) if _worker_cache else (0, 0)
+    MinimaxAI(state, weights, _worker_cache).optimal_move(depth, state, player)
+    if _worker_cache is None:
+        return 0, 0
+    return _worker_cache.hits - hits, _worker_cache.misses - misses
+
+
+def sample_positions(games, plies, seed=None):
+    """Returns (state, player) positions along random games, `plies` moves deep each."""
+    rng = random.Random(seed)
+    ai = MinimaxAI([[" "] * 7 for _ in range(6)])
+    positions = []
+    for _ in range(games):
+        state = [row.copy() for row in ai.board]
+        for ply in range(plies):
+            player = ai.players[ply % 2]
+            positions.append((state, player))
+            state = ai.simulate_move(state, rng.choice(range(7)), player)
+    return positions
+
+
+def benchmark(workers=4, games=4, plies=8, depth=3, entries=1 << 20, seed=None, path=None, weights=None):
+    """
+    Search the same positions with a worker pool three times: without a cache, with a
+    private cache per worker and with one shared cache. The shared cache starts from
+    and is saved back to `path` when given. Returns the wall time and hit rate of each run.
+    """
+    tasks = [(state, player, depth, weights) for state, player in sample_positions(games, plies, seed)]
+    results = {}
+
+    shared = SharedPositionCache(entries, path=path, weights=weights)
+    try:
+        runs = [("none", None, ()), ("private", _init_private_worker, (entries, weights)),
+                ("shared", _init_worker, (shared,))]
+        for mode, initializer, initargs in runs:
+            start = time.perf_counter()
+            pool = Pool(workers, initializer, initargs)
+            try:
+                counts = pool.map(_search, tasks, chunksize=1)
+            finally:
+                # Let the workers exit normally so private caches are freed
+                pool.close()
+                pool.join()
+            hits, misses = sum(c[0] for c in counts), sum(c[1] for c in counts)
+            results[mode] = {"seconds": time.perf_counter() - start,
+                             "hit_rate": hits / (hits + misses) if hits + misses else 0.0}
+        if path is not None:
+            shared.save(path)
+    finally:
+        shared.close()
+
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure the shared position cache on a worker pool.")
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--games", type=int, default=4, help="random games to sample positions from")
+    parser.add_argument("--plies", type=int, default=8, help="positions sampled per game")
+    parser.add_argument("--depth", type=int, default=3, help="search depth per position")
+    parser.add_argument("--entries", type=int, default=1 << 20, help="cache size in records")
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--cache-file", default=None, help="file to warm the shared cache from and save it to")
+    parser.add_argument("--weights", default=None,
+                        help="parameter file of tuned evaluation weights (default: streak heuristic)")
+    args = parser.parse_args()
+
+    weights = None
+    if args.weights is not None:
+        weights = load_weights(args.weights)
+        if weights is None:
+            parser.error(f"no parameter file at {args.weights}")
+    results = benchmark(args.workers, args.games, args.plies, args.depth, args.entries, args.seed,
+                        args.cache_file, weights)
+    for mode, result in results.items():
+        speedup = results["none"]["seconds"] / result["seconds"]
+        print(f"{mode:<8} {result['seconds']:7.2f}s  {speedup:5.2f}x  hit rate {result['hit_rate']:.1%}")
+
+
+if __name__ == "__main__":
+    main()
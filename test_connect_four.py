@@ -70,5 +70,27 @@ class TestConnectFourGame(unittest.TestCase):
         self.assertFalse(self.game.diagonal_check(3, 0)[0])
 
 
+class TestAIPlayer(unittest.TestCase):
+    def test_weights(self):
+        # None selects the streak heuristic even when weights.json exists
+        self.assertIsNone(AIPlayer("Test AI", "x", weights=None).weights)
+        weights = [1.0] * 7
+        self.assertEqual(AIPlayer("Test AI", "x", weights=weights).weights, weights)
+        # Weight arrays from tuning.fit_weights are stored as plain floats
+        try:
+            import numpy as np
+        except ImportError:
+            return
+        self.assertEqual(AIPlayer("Test AI", "x", weights=np.ones(7)).weights, weights)
+
+    def test_move_on_game_board(self):
+        # The AI reads the game board bottom row first and takes the winning move
+        board = [[" " for _ in range(7)] for _ in range(6)]
+        board[0][:3] = ["x", "x", "x"]
+        board[0][4:] = ["o", "o", "o"]
+        for _ in range(5):
+            self.assertEqual(AIPlayer("Test AI", "x", 2, weights=None).move(board), 3)
+
+
 if __name__ == "__main__":
     unittest.main()
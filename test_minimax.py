@@ -1,5 +1,8 @@
+import json
+import os
+import tempfile
 import unittest
-from minimax import MinimaxAI  # Ensure to import your class appropriately
+from minimax import FEATURES, MinimaxAI, load_weights, save_weights
 
 class TestMinimaxAI(unittest.TestCase):
     def setUp(self):
@@ -52,5 +55,50 @@ class TestMinimaxAI(unittest.TestCase):
         self.assertIn(move, range(7))  # Move should be a valid column
         self.assertIsInstance(score, int)
 
+    def test_extract_features(self):
+        # Features are measured from the player's perspective and mirror for the opponent
+        features = self.ai.extract_features(self.initial_state, "x")
+        self.assertEqual(len(features), len(FEATURES))
+        self.assertEqual(features, [-f for f in self.ai.extract_features(self.initial_state, "o")])
+        # A lone center piece counts for the center and opens three-cell windows
+        state = self.ai.simulate_move([[" "] * 7 for _ in range(6)], 3, "x")
+        features = dict(zip(FEATURES, self.ai.extract_features(state, "x")))
+        self.assertEqual(features["center"], 1)
+        self.assertEqual(features["window_1"], 7)
+        self.assertEqual(features["window_2"], 0)
+
+    def test_evaluate_with_weights(self):
+        # Weighted evaluation is the dot product of weights and features
+        weights = [0.5, -1, 2, 3, 0, 1.5, 0.25]
+        ai = MinimaxAI(self.initial_state, weights)
+        features = ai.extract_features(self.initial_state, "x")
+        self.assertAlmostEqual(ai.evaluate(self.initial_state, "x"),
+                               sum(w * f for w, f in zip(weights, features)))
+        move, _ = ai.optimal_move(1, self.initial_state, "x")
+        self.assertIn(move, range(7))
+
+    def test_save_and_load_weights(self):
+        # Weights survive a round trip through the parameter file
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "weights.json")
+            self.assertIsNone(load_weights(path))
+            save_weights(range(len(FEATURES)), path, games=1)
+            self.assertEqual(load_weights(path), [float(i) for i in range(len(FEATURES))])
+            # Malformed parameter files are reported as ValueError
+            with open(path, "w") as f:
+                f.write("[1, 2")
+            self.assertRaises(ValueError, load_weights, path)
+            with open(path, "w") as f:
+                f.write("[1, 2]")
+            self.assertRaises(ValueError, load_weights, path)
+            for bad in [None, [1], "nan"]:
+                save_weights(range(len(FEATURES)), path)
+                with open(path) as f:
+                    params = json.load(f)
+                params["weights"]["window_1"] = bad
+                with open(path, "w") as f:
+                    json.dump(params, f)
+                self.assertRaises(ValueError, load_weights, path)
+
 if __name__ == '__main__':
     unittest.main()
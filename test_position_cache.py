@@ -0,0 +1,132 @@
+import os
+import pickle
+import tempfile
+import unittest
+from connect_four import AIPlayer
+from minimax import MinimaxAI
+from position_cache import SharedPositionCache, position_key
+
+WEIGHTS = [-0.046, 0.071, -0.372, 2.766, -1.806, 1.166, 0.404]
+
+
+class TestSharedPositionCache(unittest.TestCase):
+    def setUp(self):
+        self.state = [
+            [" ", " ", " ", " ", " ", " ", " "],
+            [" ", " ", " ", " ", " ", " ", " "],
+            [" ", " ", " ", " ", " ", " ", " "],
+            [" ", " ", " ", " ", " ", " ", " "],
+            [" ", " ", " ", "o", " ", " ", " "],
+            [" ", " ", "x", "x", "o", " ", " "]
+        ]
+        self.cache = SharedPositionCache(1024)
+
+    def tearDown(self):
+        self.cache.close()
+
+    def test_position_key(self):
+        # Keys depend on the pieces and the player to move, not on highlighting
+        highlighted = [row.copy() for row in self.state]
+        highlighted[5][2] = "X"
+        self.assertEqual(position_key(self.state, "x"), position_key(highlighted, "x"))
+        self.assertNotEqual(position_key(self.state, "x"), position_key(self.state, "o"))
+
+    def test_store_and_probe(self):
+        # A stored result is returned for its own key only
+        key = position_key(self.state, "x")
+        self.assertIsNone(self.cache.probe(key))
+        self.cache.store(key, 3, -float('inf'), move=4)
+        entry = self.cache.lookup(self.state, "x")
+        self.assertEqual((entry.depth, entry.score, entry.move), (3, -float('inf'), 4))
+        self.assertIsNone(self.cache.probe(key + 1024))  # same slot, different position
+        # Entries searched shallower than required count as misses
+        self.assertIsNone(self.cache.probe(key, 4))
+        self.assertIsNotNone(self.cache.probe(key, 3))
+        self.assertEqual((self.cache.hits, self.cache.misses), (2, 3))
+
+    def test_scores_are_exact(self):
+        # Scores keep their full precision and type
+        self.cache.store(1, 2, 0.262428276839911)
+        self.cache.store(2, 2, -300)
+        self.assertEqual(self.cache.probe(1).score, 0.262428276839911)
+        self.assertIsInstance(self.cache.probe(2).score, int)
+
+    def test_replacement(self):
+        # Shallower results don't replace deeper ones for the same position
+        key = position_key(self.state, "x")
+        self.cache.store(key, 3, 100)
+        self.cache.store(key, 1, 10)
+        self.assertEqual(self.cache.probe(key).score, 100)
+        # A different position in the same slot always replaces it
+        self.cache.store(key + 1024, 0, 5)
+        self.assertIsNone(self.cache.probe(key))
+
+    def test_attach_across_pickle(self):
+        # Attached copies see the same shared memory
+        attached = pickle.loads(pickle.dumps(self.cache))
+        try:
+            attached.store(42, 2, 7.5, move=1)
+            self.assertEqual(self.cache.probe(42).score, 7.5)
+        finally:
+            attached.close()
+        self.assertEqual(self.cache.probe(42).move, 1)
+
+    def test_weights_fingerprint(self):
+        # Caches refuse scores from other evaluation weights
+        self.assertRaises(ValueError, SharedPositionCache, 1024, name=self.cache.name, weights=WEIGHTS)
+        self.assertRaises(ValueError, MinimaxAI, self.state, WEIGHTS, self.cache)
+        tuned = SharedPositionCache(1024, weights=WEIGHTS)
+        try:
+            attached = pickle.loads(pickle.dumps(tuned))
+            self.assertEqual(attached.weights, WEIGHTS)
+            attached.close()
+            self.assertRaises(ValueError, MinimaxAI, self.state, None, tuned)
+        finally:
+            tuned.close()
+
+    def test_ai_player_weights_match_cache(self):
+        # AI players check the cache's weights when they are created
+        self.assertRaises(ValueError, AIPlayer, "Test AI", "x", weights=WEIGHTS, cache=self.cache)
+        self.assertIsNone(AIPlayer("Test AI", "x", cache=self.cache).weights)
+
+    def test_save_and_load(self):
+        # Saved caches start the next run warm
+        self.cache.store(42, 2, 7.5)
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "cache.bin")
+            self.cache.save(path)
+            warm = SharedPositionCache(1024, path=path)
+            cold = SharedPositionCache(2048, path=path)
+            retuned = SharedPositionCache(1024, path=path, weights=WEIGHTS)
+            try:
+                self.assertEqual(warm.probe(42).score, 7.5)
+                self.assertIsNone(cold.probe(42))
+                self.assertIsNone(retuned.probe(42))
+            finally:
+                warm.close()
+                cold.close()
+                retuned.close()
+
+    def test_minimax_with_cache(self):
+        # Cached searches give the same scores and hit the cache on repeated positions
+        ai = MinimaxAI(self.state)
+        cached = MinimaxAI(self.state, cache=self.cache)
+        self.assertEqual(cached.minimax(3, self.state, "x"), ai.minimax(3, self.state, "x"))
+        self.assertGreater(self.cache.hits, 0)
+        self.assertEqual(cached.minimax(3, self.state, "x"), ai.minimax(3, self.state, "x"))
+
+    def test_minimax_with_cache_and_weights(self):
+        # Cache hits return exactly the score of a fresh search with tuned weights
+        cache = SharedPositionCache(1024, weights=WEIGHTS)
+        try:
+            ai = MinimaxAI(self.state, WEIGHTS)
+            cached = MinimaxAI(self.state, WEIGHTS, cache)
+            expected = ai.minimax(3, self.state, "o")
+            self.assertEqual(cached.minimax(3, self.state, "o"), expected)
+            self.assertEqual(cached.minimax(3, self.state, "o"), expected)
+            self.assertGreater(cache.hits, 0)
+        finally:
+            cache.close()
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,58 @@
+import random
+import unittest
+
+try:
+    import numpy as np
+    import tuning
+except ImportError:
+    np = None
+
+from minimax import FEATURES, MinimaxAI
+
+
+@unittest.skipIf(np is None, "numpy is required for tuning")
+class TestTuning(unittest.TestCase):
+    def setUp(self):
+        # Collect a few positions from random play
+        rng = random.Random(0)
+        self.ai = MinimaxAI([[" "] * 7 for _ in range(6)])
+        self.states, self.players = [], []
+        state = [row.copy() for row in self.ai.board]
+        for ply in range(30):
+            player = self.ai.players[ply % 2]
+            self.states.append(state)
+            self.players.append(player)
+            legal = [col for col in range(7) if self.ai.valid_move(col, state)]
+            state = self.ai.simulate_move(state, rng.choice(legal), player)
+
+    def test_encode_positions(self):
+        # The player to move is encoded as +1 and the opponent as -1
+        boards = tuning.encode_positions(self.states, self.players)
+        self.assertEqual(boards.shape, (30, 6, 7))
+        self.assertEqual(np.abs(boards[10]).sum(), 10)
+        self.assertEqual(boards[10].sum(), 0)  # x to move, equal piece counts
+
+    def test_extract_features_matches_minimax(self):
+        # The vectorized features agree with MinimaxAI.extract_features
+        features = tuning.extract_features(tuning.encode_positions(self.states, self.players))
+        self.assertEqual(features.shape, (30, len(FEATURES)))
+        for row, state, player in zip(features, self.states, self.players):
+            self.assertEqual(list(row), self.ai.extract_features(state, player))
+
+    def test_fit_weights(self):
+        # Fitting recovers the sign of the feature that decides the outcome
+        rng = np.random.default_rng(0)
+        features = rng.normal(size=(500, len(FEATURES)))
+        outcomes = (features[:, 5] > 0).astype(float)
+        weights = tuning.fit_weights(features, outcomes, epochs=500)
+        self.assertEqual(int(np.argmax(np.abs(weights))), 5)
+        self.assertGreater(weights[5], 0)
+
+    def test_self_play(self):
+        # Every position gets an outcome label from the side to move
+        boards, outcomes = tuning.self_play(2, depth=1, epsilon=0.5, seed=0)
+        self.assertEqual(len(boards), len(outcomes))
+        self.assertTrue(set(outcomes) <= {0.0, 0.5, 1.0})
+
+if __name__ == '__main__':
+    unittest.main()
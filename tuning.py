@@ -0,0 +1,194 @@
+"""Self-play tuning of the MinimaxAI evaluation weights.
+
+Plays shallow self-play games, turns every position reached into a feature
+vector (see minimax.FEATURES), fits weights against the game outcomes and
+writes them to a parameter file that MinimaxAI/AIPlayer load.
+
+    python3 tuning.py --games 300 --output weights.json --benchmark-games 20
+"""
+import argparse
+import random
+import time
+
+import numpy as np
+
+from minimax import BOTTOM_ROW, FEATURES, WINDOWS, DEFAULT_WEIGHTS_PATH, MinimaxAI, save_weights
+
+# Flat board indices (row * 7 + col) of every four-cell window, shape (69, 4)
+WINDOW_INDEX = np.array([[row * 7 + col for row, col in window] for window in WINDOWS])
+
+
+def encode_positions(states, players):
+    """Encode boards as an int8 array of shape (N, 6, 7): +1 for the player to move, -1 for the opponent."""
+    boards = np.zeros((len(states), 6, 7), dtype=np.int8)
+    for n, (state, player) in enumerate(zip(states, players)):
+        for row in range(6):
+            for col in range(7):
+                if state[row][col] != " ":
+                    boards[n, row, col] = 1 if state[row][col] == player else -1
+    return boards
+
+
+def extract_features(boards):
+    """Vectorized MinimaxAI.extract_features over encoded boards, returns shape (N, len(FEATURES))."""
+    flat = boards.reshape(len(boards), 42)
+    cells = flat[:, WINDOW_INDEX]
+
+    # Empty cells that the next piece dropped in their column would land on
+    supported = np.ones(boards.shape, dtype=bool)
+    supported[:, :BOTTOM_ROW, :] = boards[:, 1:, :] != 0
+    playable = ((boards == 0) & supported).reshape(len(boards), 42)[:, WINDOW_INDEX].any(axis=-1)
+
+    features = []
+    for sign in (1, -1):
+        mine = (cells == sign).sum(axis=-1)
+        theirs = (cells == -sign).sum(axis=-1)
+        open_windows = theirs == 0
+        features.append(np.stack([
+            ((mine == 1) & open_windows).sum(axis=1),
+            ((mine == 2) & open_windows).sum(axis=1),
+            ((mine == 3) & open_windows).sum(axis=1),
+            ((mine == 3) & open_windows & playable).sum(axis=1),
+            ((mine == 3) & (theirs == 1)).sum(axis=1),
+            (boards[:, :, 3] == sign).sum(axis=1),
+            (boards[:, :, [2, 4]] == sign).sum(axis=(1, 2)),
+        ], axis=1))
+
+    return (features[0] - features[1]).astype(np.float64)
+
+
+def play_game(ai_depths, weights=(None, None), epsilon=0.0, opening_moves=0, rng=random):
+    """
+    Play one game between two MinimaxAI players ('x' moves first).
+    Returns the visited (state, player to move) positions, the winner color or None,
+    and the time each color spent choosing moves.
+    """
+    ai = MinimaxAI([[" "] * 7 for _ in range(6)])
+    state = [row.copy() for row in ai.board]
+    positions = []
+    think_time = {color: 0.0 for color in ai.players}
+    turn = 0
+
+    for ply in range(42):
+        player = ai.players[turn]
+        positions.append((state, player))
+        legal = [col for col in range(7) if ai.valid_move(col, state)]
+
+        if ply < opening_moves or rng.random() < epsilon:
+            move = rng.choice(legal)
+        else:
+            searcher = MinimaxAI(state, weights[turn])
+            start = time.perf_counter()
+            move, _ = searcher.optimal_move(ai_depths[turn], state, player)
+            think_time[player] += time.perf_counter() - start
+
+        state = ai.simulate_move(state, move, player)
+        if ai.count_streak(state, player, 4):
+            return positions, player, think_time
+        turn = 1 - turn
+
+    return positions, None, think_time
+
+
+def self_play(games, depth=1, epsilon=0.2, weights=None, seed=None):
+    """
+    Generate training positions from self-play games.
+    Returns encoded boards (N, 6, 7) and outcomes (N,) from the view of the player to move:
+    1 for a win, 0 for a loss and 0.5 for a draw.
+    """
+    rng = random.Random(seed)
+    states, players, outcomes = [], [], []
+    for _ in range(games):
+        positions, winner, _ = play_game((depth, depth), (weights, weights), epsilon, rng=rng)
+        for state, player in positions:
+            states.append(state)
+            players.append(player)
+            outcomes.append(0.5 if winner is None else float(player == winner))
+    return encode_positions(states, players), np.array(outcomes)
+
+
+def fit_weights(features, outcomes, epochs=2000, learning_rate=0.5, l2=1e-3):
+    """
+    Fit logistic-regression weights so sigmoid(features @ weights) predicts the outcomes.
+    Runs full-batch gradient descent on standardized features and returns weights
+    on the original feature scale.
+    """
+    scale = features.std(axis=0)
+    scale[scale == 0] = 1.0
+    x = features / scale
+    weights = np.zeros(x.shape[1])
+
+    for _ in range(epochs):
+        predictions = 1.0 / (1.0 + np.exp(-(x @ weights)))
+        gradient = x.T @ (predictions - outcomes) / len(x) + l2 * weights
+        weights -= learning_rate * gradient
+
+    return weights / scale
+
+
+def benchmark(weights, depth=2, baseline_depth=3, games=20, seed=None):
+    """
+    Play the tuned evaluator at `depth` against the streak heuristic at `baseline_depth`,
+    alternating who moves first. Returns win/draw/loss counts for the tuned side and
+    the mean thinking time per game of each side.
+    """
+    rng = random.Random(seed)
+    results = {"wins": 0, "draws": 0, "losses": 0, "tuned_seconds": 0.0, "baseline_seconds": 0.0}
+
+    for game in range(games):
+        tuned = game % 2
+        depths = [baseline_depth, baseline_depth]
+        players_weights = [None, None]
+        depths[tuned], players_weights[tuned] = depth, list(weights)
+
+        # A couple of random opening moves keep the games from repeating
+        _, winner, think_time = play_game(depths, players_weights, opening_moves=2, rng=rng)
+        tuned_color, baseline_color = ("x", "o") if tuned == 0 else ("o", "x")
+        if winner is None:
+            results["draws"] += 1
+        elif winner == tuned_color:
+            results["wins"] += 1
+        else:
+            results["losses"] += 1
+        results["tuned_seconds"] += think_time[tuned_color] / games
+        results["baseline_seconds"] += think_time[baseline_color] / games
+
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Tune MinimaxAI evaluation weights from self-play.")
+    parser.add_argument("--games", type=int, default=300, help="number of self-play games")
+    parser.add_argument("--depth", type=int, default=1, help="search depth used during self-play")
+    parser.add_argument("--epsilon", type=float, default=0.2, help="chance of a random self-play move")
+    parser.add_argument("--output", default=DEFAULT_WEIGHTS_PATH, help="parameter file to write")
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--benchmark-games", type=int, default=0,
+                        help="games to play against the streak heuristic after tuning")
+    parser.add_argument("--benchmark-depth", type=int, default=2, help="search depth of the tuned player")
+    parser.add_argument("--baseline-depth", type=int, default=3, help="search depth of the baseline player")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    boards, outcomes = self_play(args.games, args.depth, args.epsilon, seed=args.seed)
+    features = extract_features(boards)
+    weights = fit_weights(features, outcomes)
+    print(f"Fitted {len(FEATURES)} weights on {len(boards)} positions "
+          f"in {time.perf_counter() - start:.1f}s")
+    for name, weight in zip(FEATURES, weights):
+        print(f"  {name:<18} {weight:+.4f}")
+
+    save_weights(weights, args.output, games=args.games, positions=len(boards), depth=args.depth)
+    print(f"Weights written to {args.output}")
+
+    if args.benchmark_games:
+        results = benchmark(weights, args.benchmark_depth, args.baseline_depth,
+                            args.benchmark_games, seed=args.seed)
+        print(f"Tuned (depth {args.benchmark_depth}) vs streak heuristic (depth {args.baseline_depth}): "
+              f"{results['wins']} wins, {results['draws']} draws, {results['losses']} losses")
+        print(f"Thinking time per game: tuned {results['tuned_seconds']:.2f}s, "
+              f"baseline {results['baseline_seconds']:.2f}s")
+
+
+if __name__ == "__main__":
+    main()